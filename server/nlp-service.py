@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+German NLP Service (spaCy + Simplemma)
+Provides lemmatization, POS tagging, and more for German text
+Actions:
+  spacy_lemma (default, alias: lemmatize) - spaCy lemma, POS and morphology for a word
+  simplemma                               - Simplemma lemma for a word
+  analyze                                 - full spaCy sentence analysis
+Communication via length-prefixed JSON frames over stdin/stdout:
+each message is a 4-byte little-endian length followed by UTF-8 JSON
+"""
+
+import os
+import queue
+import sys
+import threading
+
+# stdout carries only length-prefixed frames: keep a private handle on it and
+# point fd 1 and sys.stdout at stderr, so a stray print() from this file or a
+# dependency cannot desync the frame stream
+_FRAME_FD = os.dup(sys.stdout.fileno())
+os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+sys.stdout = sys.stderr
+
+try:
+    import spacy
+except ImportError:
+    print("ERROR: spacy not installed. Run: pip install spacy", file=sys.stderr)
+    sys.exit(1)
+
+# Simplemma is optional; only the simplemma action depends on it
+try:
+    import simplemma
+except ImportError:
+    simplemma = None
+    print("WARNING: simplemma not installed, simplemma action disabled. Run: pip install simplemma", file=sys.stderr)
+else:
+    # Bind the lemmatize callable once: simplemma >= 1.0 exposes a reusable
+    # Lemmatizer instance, older versions only the module-level function
+    if hasattr(simplemma, "Lemmatizer"):
+        _simplemma_lemmatize = simplemma.Lemmatizer().lemmatize
+    else:
+        _simplemma_lemmatize = simplemma.lemmatize
+
+# Load German model once at startup
+try:
+    nlp = spacy.load("de_core_news_sm")
+except OSError:
+    print("ERROR: German model not installed. Run: python -m spacy download de_core_news_sm", file=sys.stderr)
+    sys.exit(1)
+
+# Prefer orjson (C implementation, emits UTF-8 bytes); fall back to stdlib json
+try:
+    import orjson as _json
+
+    def _dumps(obj) -> bytes:
+        return _json.dumps(obj)
+except ImportError:
+    import json as _json
+
+    def _dumps(obj) -> bytes:
+        return _json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _frame(payload: bytes) -> bytes:
+    """
+    Prefix an encoded message with its 4-byte little-endian length
+    """
+    return len(payload).to_bytes(4, "little") + payload
+
+
+# Static error responses are serialized once instead of on every hit
+_ERR_MISSING_WORD = _frame(_dumps({"error": "Missing word field"}))
+_ERR_MISSING_TEXT = _frame(_dumps({"error": "Missing text field"}))
+_ERR_NO_SIMPLEMMA = _frame(_dumps({"error": "simplemma not installed"}))
+
+# Single-word lemmatization never needs the parser or NER; they are disabled
+# per call rather than kept in a second copy of the model
+_LEMMA_DISABLED = [name for name in ("parser", "ner") if name in nlp.pipe_names]
+
+# de_core_news_sm ships without static word vectors. spaCy would then report
+# has_vector/vector_norm from the tok2vec tensor, but no caller reads either
+# field, so they are omitted unless the model has real vectors
+_HAS_VECTORS = nlp.vocab.vectors_length > 0
+
+# Batching limits for draining the request queue and feeding nlp.pipe
+_MAX_BATCH = 128
+_PIPE_BATCH_SIZE = 50
+
+
+# Encoded response frames for word-level actions: (action, word) -> bytes
+# German word frequencies are Zipfian, so most lookups are repeats; a hit
+# skips both the lemma lookup and JSON encoding. This is the only per-word
+# cache for either action; evicted FIFO
+_RESPONSE_CACHE_SIZE = 100_000
+_response_cache = {}
+
+# High-frequency words whose responses are serialized once at startup
+_HOT_WORDS = (
+    "der", "die", "das", "den", "dem", "des", "ein", "eine", "einen", "einem",
+    "einer", "eines", "und", "oder", "aber", "denn", "sondern", "ich", "du", "er",
+    "sie", "es", "wir", "ihr", "mich", "mir", "dich", "dir", "sich", "uns",
+    "euch", "ihn", "ihm", "ihnen", "mein", "meine", "sein", "seine", "ihre", "unser",
+    "nicht", "kein", "keine", "auch", "noch", "schon", "nur", "so", "wie", "als",
+    "wenn", "dass", "ob", "weil", "da", "dann", "doch", "ja", "nein", "sehr",
+    "mehr", "in", "im", "an", "am", "auf", "aus", "bei", "mit", "nach",
+    "von", "vom", "zu", "zum", "zur", "für", "über", "unter", "vor", "durch",
+    "gegen", "ohne", "um", "bis", "seit", "ist", "sind", "war", "waren", "bin",
+    "bist", "hat", "haben", "hatte", "hatten", "wird", "werden", "wurde", "wurden", "kann",
+    "können", "muss", "müssen", "soll", "sollen", "will", "wollen", "man", "hier", "dort",
+    "jetzt", "heute", "immer", "wieder", "alle", "alles", "viel", "viele", "was", "wer",
+    "wo", "wann", "warum",
+)
+
+
+def lemmatize(word: str, language: str = "de") -> dict:
+    """
+    Lemmatize a single German word using Simplemma
+    """
+    try:
+        # simplemma returns the single most likely lemma as a string
+        lemma = _simplemma_lemmatize(word, lang=language)
+
+        if lemma:
+            if not isinstance(lemma, str):
+                lemma = next(iter(lemma))
+            return {
+                "word": word,
+                "lemma": lemma,
+                "confidence": 0.95 if lemma != word else 0.3,
+                "method": "simplemma"
+            }
+        else:
+            return {
+                "word": word,
+                "lemma": word,
+                "confidence": 0.3,
+                "method": "heuristic"
+            }
+    except Exception as e:
+        return {
+            "word": word,
+            "lemma": word,
+            "confidence": 0.0,
+            "error": str(e),
+            "method": "error"
+        }
+
+
+def _lemma_result(word: str, doc) -> dict:
+    """
+    Build the lemmatization response for a word from its processed Doc
+    """
+    if len(doc) > 0:
+        token = doc[0]
+        return {
+            "word": word,
+            "lemma": token.lemma_,
+            "pos": token.pos_,          # Universal POS (NOUN, VERB, ADJ, etc.)
+            "tag": token.tag_,          # Language-specific tag (NN, VV, ADJ, etc.)
+            "morph": token.morph.to_dict(),  # Morphological features (case, tense, etc.)
+            "confidence": 0.95,
+            "method": "spacy"
+        }
+    else:
+        return {
+            "word": word,
+            "lemma": word,
+            "confidence": 0.0,
+            "error": "Empty document",
+            "method": "error"
+        }
+
+
+def lemmatize_word(word: str) -> dict:
+    """
+    Lemmatize and tag a single word using spaCy
+    Returns: lemma, POS tag, and detailed morphology
+    """
+    try:
+        return _lemma_result(word, nlp(word, disable=_LEMMA_DISABLED))
+    except Exception as e:
+        return {
+            "word": word,
+            "lemma": word,
+            "confidence": 0.0,
+            "error": str(e),
+            "method": "error"
+        }
+
+
+def lemmatize_words(words: list) -> list:
+    """
+    Lemmatize a batch of words with a single nlp.pipe() pass over the
+    distinct words
+    Falls back to word-by-word processing if the batch fails
+    """
+    unique = list(dict.fromkeys(words))
+    try:
+        docs = nlp.pipe(unique, batch_size=_PIPE_BATCH_SIZE, disable=_LEMMA_DISABLED)
+        results = {word: _lemma_result(word, doc) for word, doc in zip(unique, docs)}
+    except Exception:
+        results = {word: lemmatize_word(word) for word in unique}
+    return [results[word] for word in words]
+
+
+def _build_token_dict(token) -> dict:
+    """
+    Build the analysis entry for a single token
+    """
+    # Morphological features as a dictionary (case, tense, etc.)
+    morph_dict = token.morph.to_dict()
+    # Log if we have a verb/noun/adj with no morphology
+    if not morph_dict and token.pos_ in ['VERB', 'NOUN', 'ADJ']:
+        print(f"WARNING: No morphology for '{token.text}' (pos={token.pos_}, tag={token.tag_})", file=sys.stderr)
+
+    token_dict = {
+        "text": token.text,
+        "lemma": token.lemma_,
+        "pos": token.pos_,
+        "tag": token.tag_,
+        "dep": token.dep_,
+        "head": token.head.text,
+        "morph": morph_dict  # Morphological features (case, tense, etc.)
+    }
+    if _HAS_VECTORS:
+        token_dict["has_vector"] = token.has_vector
+        # Convert vector_norm to float to avoid JSON serialization issues
+        token_dict["vector_norm"] = float(token.vector_norm) if token.has_vector else None
+    return token_dict
+
+
+def _analysis_result(text: str, doc, entities: bool = True) -> dict:
+    """
+    Build the sentence analysis response from a processed Doc
+    """
+    tokens = [_build_token_dict(token) for token in doc]
+
+    result = {
+        "success": True,
+        "text": text,
+        "tokens": tokens,
+        "method": "spacy"
+    }
+
+    # Extract named entities
+    if entities:
+        result["entities"] = [
+            {
+                "text": ent.text,
+                "label": ent.label_,
+                "start": ent.start_char,
+                "end": ent.end_char
+            }
+            for ent in doc.ents
+        ]
+
+    return result
+
+
+def analyze_sentence(text: str, entities: bool = True) -> dict:
+    """
+    Full sentence analysis: lemmatization, POS, dependencies
+    Named entities are only extracted (and NER only run) when requested
+    """
+    try:
+        disabled = [] if entities else ["ner"]
+        return _analysis_result(text, nlp(text, disable=disabled), entities)
+    except Exception as e:
+        return {
+            "success": False,
+            "text": text,
+            "error": str(e),
+            "method": "error"
+        }
+
+
+def analyze_sentences(texts: list, entities: bool = True) -> list:
+    """
+    Analyze a batch of sentences with a single nlp.pipe() pass
+    Falls back to sentence-by-sentence processing if the batch fails
+    """
+    try:
+        disabled = [] if entities else ["ner"]
+        docs = nlp.pipe(texts, batch_size=_PIPE_BATCH_SIZE, disable=disabled)
+        return [_analysis_result(text, doc, entities) for text, doc in zip(texts, docs)]
+    except Exception:
+        return [analyze_sentence(text, entities) for text in texts]
+
+
+_HOT_RESPONSES = {
+    word: _frame(_dumps(result))
+    for word, result in zip(_HOT_WORDS, lemmatize_words(list(_HOT_WORDS)))
+    if result["method"] == "spacy"
+}
+
+
+def _encode_word_response(key: tuple, result: dict) -> bytes:
+    """
+    Encode a word-level response and remember it unless it is an error
+    """
+    payload = _frame(_dumps(result))
+    if result["method"] != "error":
+        _response_cache[key] = payload
+        if len(_response_cache) > _RESPONSE_CACHE_SIZE:
+            del _response_cache[next(iter(_response_cache))]
+    return payload
+
+
+def _decode_request(payload: bytes):
+    """
+    Decode a request frame
+    Returns: the request dict, or a ready-to-send error frame if decoding fails
+    """
+    try:
+        return _json.loads(payload)
+    except ValueError as e:
+        # JSONDecodeError and UnicodeDecodeError (stdlib json on invalid UTF-8)
+        return _frame(_dumps({"error": f"Invalid JSON: {str(e)}"}))
+    except Exception as e:
+        return _frame(_dumps({"error": f"Unexpected error: {str(e)}"}))
+
+
+def _read_requests(stdin, requests: queue.Queue) -> None:
+    """
+    Reader thread: decode request frames from stdin into the queue, so the
+    next batch is already waiting when the NLP work for the current one ends
+    Puts None once stdin is closed
+    """
+    try:
+        while (header := stdin.read(4)):
+            size = int.from_bytes(header, "little")
+            payload = stdin.read(size)
+            if len(header) < 4 or len(payload) < size:
+                break  # stdin closed mid-frame
+            requests.put(_decode_request(payload))
+    finally:
+        requests.put(None)
+
+
+def _handle_batch(requests: list) -> list:
+    """
+    Run the NLP work for a batch of decoded requests
+    Returns: encoded response frames, in request order
+    """
+    responses = []
+    lemma_jobs = []     # (response slot, word)
+    analyze_jobs = {True: [], False: []}   # entities flag -> [(response slot, text)]
+
+    for request in requests:
+        if isinstance(request, bytes):
+            responses.append(request)   # already an error frame
+            continue
+
+        try:
+            action = request.get("action", "spacy_lemma")
+
+            if action in ("spacy_lemma", "lemmatize"):
+                word = request.get("word", "").lower()
+                if not word:
+                    responses.append(_ERR_MISSING_WORD)
+                    continue
+                cached = _HOT_RESPONSES.get(word) or _response_cache.get(("spacy_lemma", word))
+                if cached is not None:
+                    responses.append(cached)
+                    continue
+                lemma_jobs.append((len(responses), word))
+                responses.append(None)
+
+            elif action == "simplemma":
+                word = request.get("word", "").lower()
+                if not word:
+                    responses.append(_ERR_MISSING_WORD)
+                elif simplemma is None:
+                    responses.append(_ERR_NO_SIMPLEMMA)
+                else:
+                    key = ("simplemma", word)
+                    cached = _response_cache.get(key)
+                    if cached is None:
+                        cached = _encode_word_response(key, lemmatize(word))
+                    responses.append(cached)
+
+            elif action == "analyze":
+                text = request.get("text", "")
+                if not text:
+                    responses.append(_ERR_MISSING_TEXT)
+                    continue
+                entities = bool(request.get("entities", True))
+                analyze_jobs[entities].append((len(responses), text))
+                responses.append(None)
+
+            else:
+                responses.append(_frame(_dumps({"error": f"Unknown action: {action}"})))
+
+        except Exception as e:
+            responses.append(_frame(_dumps({"error": f"Unexpected error: {str(e)}"})))
+
+    if lemma_jobs:
+        results = lemmatize_words([word for _, word in lemma_jobs])
+        for (slot, word), result in zip(lemma_jobs, results):
+            responses[slot] = _encode_word_response(("spacy_lemma", word), result)
+
+    for entities, jobs in analyze_jobs.items():
+        if not jobs:
+            continue
+        results = analyze_sentences([text for _, text in jobs], entities)
+        for (slot, _), result in zip(jobs, results):
+            responses[slot] = _frame(_dumps(result))
+
+    return responses
+
+
+def main():
+    """
+    Main loop: take batches of requests queued by the stdin reader thread,
+    return JSON frames to stdout
+    """
+    requests = queue.Queue(maxsize=_MAX_BATCH)
+    reader = threading.Thread(target=_read_requests, args=(sys.stdin.buffer, requests), daemon=True)
+    reader.start()
+
+    out = open(_FRAME_FD, "wb", buffering=1 << 16, closefd=False)
+    eof = False
+
+    try:
+        while not eof:
+            # Block for one request, then take whatever else is already queued
+            batch = [requests.get()]
+            while len(batch) < _MAX_BATCH:
+                try:
+                    batch.append(requests.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                batch.pop()
+                eof = True
+
+            # One flush per batch: responses never wait on later requests
+            for response in _handle_batch(batch):
+                out.write(response)
+            out.flush()
+    finally:
+        out.flush()
+
+
+if __name__ == "__main__":
+    print("German NLP Service ready", file=sys.stderr)
+    main()
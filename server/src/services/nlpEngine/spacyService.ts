@@ -1,6 +1,8 @@
 /**
  * spaCy German NLP Service Wrapper
  * Manages communication with Python spaCy service via child process
+ * Messages in both directions are length-prefixed JSON frames
+ * (4-byte little-endian length followed by UTF-8 JSON)
  */
 
 import { spawn, ChildProcess } from 'child_process';
@@ -11,7 +13,6 @@ export interface SpacyLemmatizerResult {
   lemma: string;
   pos?: string;          // Universal POS (NOUN, VERB, ADJ, ADP, etc.)
   tag?: string;          // Language-specific tag (NN, VV, ADJ, etc.)
-  dep?: string;          // Dependency relation
   morph?: Record<string, string>;  // Morphological features
   confidence: number;
   method: string;
@@ -25,7 +26,7 @@ export interface SpacyToken {
   tag: string;
   dep: string;
   head: string;
-  has_vector: boolean;
+  has_vector?: boolean;  // Only present when the model ships word vectors
   vector_norm?: number;
   morph?: Record<string, string>;  // Morphological features
 }
@@ -44,6 +45,48 @@ export interface SpacyAnalysisResult {
   method: string;
 }
 
+// Upper bound on a single response frame; a larger length prefix means the
+// stdout stream is out of sync (e.g. unframed output from the child)
+export const MAX_FRAME_SIZE = 16 * 1024 * 1024;
+
+export interface DecodedFrames {
+  frames: string[];     // Complete frame payloads, in stream order
+  rest: Buffer;         // Leading bytes of a frame that has not fully arrived
+  oversized?: number;   // Set when a length prefix exceeds MAX_FRAME_SIZE
+}
+
+/**
+ * Encode a message as a length-prefixed JSON frame
+ */
+export function encodeFrame(message: any): Buffer {
+  const payload = Buffer.from(JSON.stringify(message), 'utf8');
+  const header = Buffer.alloc(4);
+  header.writeUInt32LE(payload.length, 0);
+  return Buffer.concat([header, payload]);
+}
+
+/**
+ * Split the complete frames off the front of a stdout buffer
+ * Payloads are only decoded as UTF-8 once the whole frame has arrived, so a
+ * multibyte character split across data events stays intact
+ */
+export function decodeFrames(buffer: Buffer): DecodedFrames {
+  const frames: string[] = [];
+  let offset = 0;
+  while (buffer.length - offset >= 4) {
+    const size = buffer.readUInt32LE(offset);
+    if (size > MAX_FRAME_SIZE) {
+      return { frames, rest: Buffer.alloc(0), oversized: size };
+    }
+    if (buffer.length - offset < 4 + size) {
+      break;
+    }
+    frames.push(buffer.subarray(offset + 4, offset + 4 + size).toString('utf8'));
+    offset += 4 + size;
+  }
+  return { frames, rest: buffer.subarray(offset) };
+}
+
 export class SpacyService {
   private process: ChildProcess | null = null;
   private ready = false;
@@ -52,6 +95,7 @@ export class SpacyService {
     resolve: (value: any) => void;
     reject: (reason?: any) => void;
   }> = [];
+  private stdoutBuffer: Buffer = Buffer.alloc(0);
   private lruCache: Map<string, any> = new Map();
   private maxCacheSize = 10000;
 
@@ -63,18 +107,18 @@ export class SpacyService {
    * Initialize the spaCy Python service
    */
   private initialize(): void {
-    // Calculate the correct path to spacy-service.py
+    // Calculate the correct path to nlp-service.py
     // In production (dist), __dirname is /path/to/dist/services/nlpEngine
-    // We need to go up to the server root and find spacy-service.py
-    // The file is at /server/spacy-service.py relative to the project
-    const scriptPath = path.join(__dirname, '../../../../spacy-service.py');
+    // We need to go up to the server root and find nlp-service.py
+    // The file is at /server/nlp-service.py relative to the project
+    const scriptPath = path.join(__dirname, '../../../../nlp-service.py');
     
     // Fallback: try to find it in common locations
     const fallbackPaths = [
-      path.join(__dirname, '../../../../spacy-service.py'),  // From dist/services/nlpEngine
-      path.join(__dirname, '../../../spacy-service.py'),      // From dist
-      path.join(process.cwd(), 'spacy-service.py'),          // In current working directory
-      '/opt/render/project/src/server/spacy-service.py',     // Render specific path
+      path.join(__dirname, '../../../../nlp-service.py'),  // From dist/services/nlpEngine
+      path.join(__dirname, '../../../nlp-service.py'),      // From dist
+      path.join(process.cwd(), 'nlp-service.py'),          // In current working directory
+      '/opt/render/project/src/server/nlp-service.py',     // Render specific path
     ];
 
     console.log(`[spaCy Service] Initialization starting...`);
@@ -97,7 +141,7 @@ export class SpacyService {
     }
     
     if (!found) {
-      console.error(`[spaCy Service] ✗ Could not find spacy-service.py in any location:`);
+      console.error(`[spaCy Service] ✗ Could not find nlp-service.py in any location:`);
       fallbackPaths.forEach(p => console.error(`  - ${p}`));
     }
 
@@ -129,6 +173,8 @@ export class SpacyService {
 
       console.log(`[spaCy Service] Spawning process with: ${pythonCmd} ${resolvedScriptPath}`);
       
+      this.stdoutBuffer = Buffer.alloc(0);
+      
       this.process = spawn(pythonCmd, [resolvedScriptPath], {
         stdio: ['pipe', 'pipe', 'pipe'],
         detached: false,
@@ -141,13 +187,20 @@ export class SpacyService {
         throw new Error('Failed to spawn process - process is null');
       }
 
-      // Handle stdout (responses)
+      const child = this.process;
+
+      // Handle stdout (responses); a frame may be split across data events
       this.process.stdout?.on('data', (data: Buffer) => {
-        const lines = data.toString().split('\n').filter(l => l.trim());
-        for (const line of lines) {
-          console.log(`[spaCy Service] stdout: ${line}`);
+        if (this.process !== child) {
+          return; // Output from a process we already killed
+        }
+        const { frames, rest, oversized } = decodeFrames(Buffer.concat([this.stdoutBuffer, data]));
+        this.stdoutBuffer = rest;
+
+        for (const payload of frames) {
+          console.log(`[spaCy Service] stdout: ${payload}`);
           try {
-            const response = JSON.parse(line);
+            const response = JSON.parse(payload);
             const queued = this.queue.shift();
             if (queued) {
               queued.resolve(response);
@@ -155,10 +208,14 @@ export class SpacyService {
           } catch (e) {
             const queued = this.queue.shift();
             if (queued) {
-              queued.reject(new Error(`Invalid JSON response: ${line}`));
+              queued.reject(new Error(`Invalid JSON response: ${payload}`));
             }
           }
         }
+
+        if (oversized !== undefined) {
+          this.handleStreamDesync(oversized);
+        }
       });
 
       // Handle stderr (logs)
@@ -228,6 +285,23 @@ export class SpacyService {
     }
   }
 
+  /**
+   * Recover from a corrupted stdout frame stream: fail the pending requests
+   * and kill the child so the exit handler restarts it
+   */
+  private handleStreamDesync(size: number): void {
+    console.error(`[spaCy Service] ✗ Invalid frame length ${size} (max ${MAX_FRAME_SIZE}), stdout stream out of sync - restarting`);
+    const pending = this.queue.splice(0);
+    for (const queued of pending) {
+      queued.reject(new Error('spaCy service output stream out of sync'));
+    }
+    this.stdoutBuffer = Buffer.alloc(0);
+    const proc = this.process;
+    this.process = null;
+    this.ready = false;
+    proc?.kill();
+  }
+
   /**
    * Send request to spaCy service
    */
@@ -259,7 +333,7 @@ export class SpacyService {
       });
 
       try {
-        this.process.stdin?.write(JSON.stringify(request) + '\n');
+        this.process.stdin?.write(encodeFrame(request));
       } catch (error) {
         console.error(`[spaCy Service] ✗ Error writing to stdin [${requestId}]:`, error);
         this.queue.pop();
@@ -282,7 +356,7 @@ export class SpacyService {
 
     try {
       const result = await this.sendRequest({
-        action: 'lemmatize',
+        action: 'spacy_lemma',
         word: lowerWord
       });
 
@@ -375,10 +449,10 @@ export class SpacyService {
         reject(new Error('Health check timeout'));
       }, 5000);
 
-      // Send a simple test request using analyze action (which the service supports)
+      // Send a simple test request using spacy_lemma (cheapest action: parser and NER are skipped)
       this.sendRequest({
-        action: 'analyze',
-        text: 'Hallo'
+        action: 'spacy_lemma',
+        word: 'hallo'
       })
         .then(() => {
           clearTimeout(timeout);
@@ -419,7 +493,7 @@ export class SpacyService {
       // Try graceful shutdown first
       if (proc && proc.stdin?.writable) {
         try {
-          proc.stdin?.write(JSON.stringify({ action: 'shutdown' }) + '\n');
+          proc.stdin?.write(encodeFrame({ action: 'shutdown' }));
         } catch (error) {
           console.error('[spaCy Service] Error sending shutdown signal:', error);
         }
@@ -0,0 +1,67 @@
+/**
+ * spaCy Service Framing Unit Tests
+ * Tests for the length-prefixed JSON frame encoding/decoding used over stdio
+ */
+
+import { encodeFrame, decodeFrames, MAX_FRAME_SIZE } from '../../src/services/nlpEngine/spacyService';
+
+describe('encodeFrame', () => {
+  it('should prefix the UTF-8 payload with its little-endian byte length', () => {
+    const frame = encodeFrame({ word: 'bär' });
+    const payload = Buffer.from(JSON.stringify({ word: 'bär' }), 'utf8');
+
+    expect(frame.readUInt32LE(0)).toBe(payload.length);
+    expect(frame.subarray(4).equals(payload)).toBe(true);
+  });
+});
+
+describe('decodeFrames', () => {
+  it('should reassemble a frame split across two chunks', () => {
+    const frame = encodeFrame({ word: 'gehen', lemma: 'gehen' });
+    const first = decodeFrames(frame.subarray(0, 7));
+
+    expect(first.frames).toEqual([]);
+    expect(first.rest.length).toBe(7);
+
+    const second = decodeFrames(Buffer.concat([first.rest, frame.subarray(7)]));
+
+    expect(second.frames.map(f => JSON.parse(f))).toEqual([{ word: 'gehen', lemma: 'gehen' }]);
+    expect(second.rest.length).toBe(0);
+  });
+
+  it('should return every frame contained in a single chunk', () => {
+    const chunk = Buffer.concat([encodeFrame({ id: 1 }), encodeFrame({ id: 2 })]);
+    const { frames, rest } = decodeFrames(chunk);
+
+    expect(frames.map(f => JSON.parse(f))).toEqual([{ id: 1 }, { id: 2 }]);
+    expect(rest.length).toBe(0);
+  });
+
+  it('should keep a trailing partial frame for the next chunk', () => {
+    const second = encodeFrame({ id: 2 });
+    const chunk = Buffer.concat([encodeFrame({ id: 1 }), second.subarray(0, 2)]);
+    const { frames, rest } = decodeFrames(chunk);
+
+    expect(frames.map(f => JSON.parse(f))).toEqual([{ id: 1 }]);
+    expect(rest.equals(second.subarray(0, 2))).toBe(true);
+  });
+
+  it('should not corrupt a multibyte character split at the chunk boundary', () => {
+    const frame = encodeFrame({ word: 'ä' });
+    // 'ä' is 0xC3 0xA4; split between its two bytes
+    const splitAt = frame.indexOf(0xc3) + 1;
+    const first = decodeFrames(frame.subarray(0, splitAt));
+    const second = decodeFrames(Buffer.concat([first.rest, frame.subarray(splitAt)]));
+
+    expect(first.frames).toEqual([]);
+    expect(JSON.parse(second.frames[0])).toEqual({ word: 'ä' });
+  });
+
+  it('should flag a length prefix above MAX_FRAME_SIZE as out of sync', () => {
+    const garbage = Buffer.from('Loading model...\n', 'utf8');
+    const { frames, oversized } = decodeFrames(Buffer.concat([encodeFrame({ id: 1 }), garbage]));
+
+    expect(frames.map(f => JSON.parse(f))).toEqual([{ id: 1 }]);
+    expect(oversized).toBeGreaterThan(MAX_FRAME_SIZE);
+  });
+});